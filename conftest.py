@@ -0,0 +1 @@
+# Makes the repository root importable in tests, e.g., `import models.activity`.
@@ -0,0 +1,66 @@
+"""
+Numba-compiled kernels for the activity models.
+
+The kernels fuse the model arithmetic into a single parallel pass over the
+observations, avoiding the temporary arrays created by the equivalent chain of
+NumPy ufuncs.  They are used by `activity` for large inputs when Numba is
+available.
+
+"""
+
+import math
+
+import numpy as np
+from numba import vectorize
+
+if __package__:
+    from .activity import _SM_COEFFS
+else:
+    from activity import _SM_COEFFS
+
+
+def _make_Hy_kernel(float_type):
+    """Compile the `Hy` ufunc for one floating-point type.
+
+    The constants are converted to `float_type`, so that, e.g., the float32
+    kernel is not promoted to float64.
+
+    """
+
+    c0, c1, c2, c3, c4, c5 = map(float_type, _SM_COEFFS)
+    five = float_type(5)
+    two_and_half = float_type(2.5)
+    name = np.dtype(float_type).name
+
+    @vectorize(
+        [f"{name}({name}, {name}, {name}, {name}, {name})"],
+        target="parallel",
+        fastmath=True,
+    )
+    def kernel(H, y, rh, delta, phase):
+        log_Phi = (
+            ((((c5 * phase + c4) * phase + c3) * phase + c2) * phase + c1) * phase
+            + c0
+        )
+        return (
+            H
+            + (five - two_and_half * y) * math.log10(rh)
+            + five * math.log10(delta)
+            - two_and_half * log_Phi
+        )
+
+    return kernel
+
+
+_KERNELS = {np.dtype(t): _make_Hy_kernel(t) for t in (np.float32, np.float64)}
+
+
+def Hy(H, y, rh, delta, phase, dtype=np.float64):
+    """Element-wise `activity.Hy` computed in `dtype` (float32 or float64).
+
+    Broadcasting is handled by the ufunc machinery, so scalar parameters are
+    not expanded to the size of the observations.
+
+    """
+
+    return _KERNELS[np.dtype(dtype)](H, y, rh, delta, phase)
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from models import activity
+from models.activity import Hy, Hab, HnHy
+
+
+@pytest.mark.parametrize(
+    "H,y,rh,delta,phase,expected",
+    (
+        [0, 0, 1, 1, 0, 0],
+        [0, 0, 10, 1, 0, 5],
+        [0, 0, 1, 10, 0, 5],
+        [0, 0, 1, 1, 23, -2.5 * np.log10(0.4765)],
+        [0, 0, 1, 1, 123, -2.5 * np.log10(1.6493)],
+        [0, 0, 1, 1, 153, -2.5 * np.log10(13.1662)],
+        [10, 0, 1, 1, 0, 10],
+        [0, -1, 1, 1, 0, 0],
+        [0, -1, 10, 1, 0, 7.5],
+    ),
+)
+def test_Hy(H, y, rh, delta, phase, expected):
+    assert np.isclose(Hy(H, y, rh, delta, phase), expected, atol=0.003)
+
+
+@pytest.mark.parametrize(
+    "H,a,b,rh,delta,phase,expected",
+    (
+        [0, 0, 0, 1, 1, 0, 0],
+        [0, 1, 0, 1, 1, 0, 0],
+        [0, 1, 0, 10, 1, 0, 30],
+        [0, 1, -1, 10, 1, 0, 27.5],
+    ),
+)
+def test_Hab(H, a, b, rh, delta, phase, expected):
+    assert np.isclose(Hab(H, a, b, rh, delta, phase), expected, atol=0.003)
+
+
+@pytest.mark.parametrize(
+    "Hn,alpha,Hc,rh,delta,phase,expected",
+    (
+        [0, 0, 99, 1, 1, 0, 0],
+        [5, 0, 99, 1, 1, 0, 5],
+        [0, 1, 99, 10, 1, 0, 5],
+        [0, 1, 99, 1, 10, 0, 5],
+        [0, 0.05, 99, 1, 1, 10, 0.5],
+        [0, 0, 0, 1, 1, 0, -2.5 * np.log10(2)],
+    ),
+)
+def test_HnHy(Hn, alpha, Hc, rh, delta, phase, expected):
+    assert np.isclose(HnHy(Hn, alpha, Hc, 0, rh, delta, phase), expected, atol=0.001)
+
+
+@pytest.fixture
+def observations():
+    rng = np.random.default_rng(0)
+    n = 1000
+    H = rng.uniform(5, 15, n)
+    y = rng.uniform(-4, 0, n)
+    rh = rng.uniform(0.5, 10, n)
+    delta = rng.uniform(0.1, 10, n)
+    phase = rng.uniform(0, 150, n)
+    return H, y, rh, delta, phase
+
+
+def use_backend(monkeypatch, backend):
+    """Force Hy to evaluate arrays with `backend`."""
+    if backend != "numpy":
+        pytest.importorskip(backend)
+    monkeypatch.setattr(activity, "NUMBA_MIN_SIZE", 0 if backend == "numba" else None)
+    monkeypatch.setattr(
+        activity, "NUMEXPR_MIN_SIZE", 0 if backend == "numexpr" else None
+    )
+
+
+@pytest.mark.parametrize("backend", ("numexpr", "numba"))
+def test_Hy_backend(monkeypatch, observations, backend):
+    H, y, rh, delta, phase = observations
+    use_backend(monkeypatch, "numpy")
+    expected = Hy(H, y, rh, delta, phase)
+    expected_scalar_Hy = Hy(10, -2, rh, delta, phase)
+
+    use_backend(monkeypatch, backend)
+    assert np.allclose(Hy(H, y, rh, delta, phase), expected, rtol=0, atol=1e-10)
+    assert np.allclose(
+        Hy(10, -2, rh, delta, phase), expected_scalar_Hy, rtol=0, atol=1e-10
+    )
+
+
+def test_Hy_numpy_scalar_parameters(monkeypatch, observations):
+    H, y, rh, delta, phase = observations
+    expected = Hy(10.0, -2.0, rh, delta, phase)
+
+    # NumPy scalar parameters, e.g., from a fitter, still use the array paths
+    def _Hy(*args):
+        raise AssertionError("plain expression used")
+
+    monkeypatch.setattr(activity, "_Hy", _Hy)
+    m = Hy(np.float64(10), np.float64(-2), rh, delta, phase)
+    assert np.allclose(m, expected, rtol=0, atol=1e-10)
+
+
+def test_Hy_series():
+    pd = pytest.importorskip("pandas")
+    s = pd.Series([1.0, 2.0, 3.0], index=["a", "b", "c"])
+    m = Hy(0, 0, s, s, s)
+    assert isinstance(m, pd.Series)
+    assert list(m.index) == ["a", "b", "c"]
+    assert np.allclose(m, Hy(0, 0, s.values, s.values, s.values))
+
+
+def test_cached_schleicher_marcus_log10():
+    phase = np.linspace(0, 150, 4)
+    log_Phi = activity._cached_schleicher_marcus_log10(phase)
+    assert np.array_equal(log_Phi, activity._schleicher_marcus_log10(phase))
+    assert not log_Phi.flags.writeable
+
+    # same bytes, different shape or dtype
+    reshaped = activity._cached_schleicher_marcus_log10(phase.reshape(2, 2))
+    assert reshaped.shape == (2, 2)
+    as_int = phase.view(np.int64)
+    assert np.array_equal(
+        activity._cached_schleicher_marcus_log10(as_int),
+        activity._schleicher_marcus_log10(as_int),
+    )
+
+
+@pytest.mark.parametrize("backend", ("numpy", "numexpr", "numba"))
+def test_Hy_float32(monkeypatch, observations, backend):
+    H, y, rh, delta, phase = observations
+    use_backend(monkeypatch, "numpy")
+    expected = Hy(H, y, rh, delta, phase)
+    # float64 result for the float32-rounded inputs
+    exact = Hy(*(x.astype(np.float32) for x in observations))
+
+    use_backend(monkeypatch, backend)
+    m = Hy(H, y, rh, delta, phase, dtype=np.float32)
+    assert m.dtype == np.float32
+    assert np.allclose(m, expected, rtol=0, atol=1e-4)
+    # computed in float32: a float64 calculation cast to float32 would always
+    # be within 1 ulp of exact
+    assert (np.abs(m - exact) / np.spacing(m)).max() > 1
+
+    m = Hab(H, 1, -1, rh, delta, phase, dtype=np.float32)
+    assert m.dtype == np.float32
+    assert np.allclose(m, Hab(H, 1, -1, rh, delta, phase), rtol=0, atol=1e-4)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("astroquery")
+from astropy.table import Table
+
+from tools import fink_query_tool
+
+
+class FakeHorizons:
+    """Stands in for astroquery's Horizons, returning ephemerides in time order."""
+
+    requests = []
+
+    def __init__(self, id, location, epochs):
+        self.epochs = epochs
+        FakeHorizons.requests.append(epochs)
+
+    def ephemerides(self):
+        jd = np.sort(self.epochs)
+        return Table({"datetime_jd": jd, "r": jd - 2460000})
+
+
+class DroppingHorizons(FakeHorizons):
+    def ephemerides(self):
+        return super().ephemerides()[1:]
+
+
+@pytest.fixture
+def horizons(monkeypatch):
+    monkeypatch.setattr(fink_query_tool, "HORIZONS_MAX_EPOCHS", 3)
+    FakeHorizons.requests = []
+    return monkeypatch
+
+
+def test_query_horizons_order(horizons):
+    horizons.setattr(fink_query_tool, "Horizons", FakeHorizons)
+    mjds = [59999.5 + x for x in (7, 2, 5, 1, 9, 2, 3, 8)]
+    df = fink_query_tool.query_horizons("2P", mjds)
+
+    # unique epochs only, in batches of at most HORIZONS_MAX_EPOCHS
+    assert len(FakeHorizons.requests) == 3
+    assert all(len(epochs) <= 3 for epochs in FakeHorizons.requests)
+    assert np.allclose(df["datetime_jd"], np.array(mjds) + 2400000.5)
+    assert np.allclose(df["r"], [7, 2, 5, 1, 9, 2, 3, 8])
+
+
+def test_query_horizons_missing_epochs(horizons):
+    horizons.setattr(fink_query_tool, "Horizons", DroppingHorizons)
+    with pytest.raises(ValueError):
+        fink_query_tool.query_horizons("2P", [60000, 60001, 60002, 60003])
@@ -2,15 +2,27 @@ import requests
 import pandas as pd
 import io
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 def jd_to_mjd(jd):
     # Convert Julian Date (JD) to Modified Julian Date (MJD)
     mjd = jd - 2400000.5
     return mjd
 
+from astropy.table import vstack
 from astroquery.jplhorizons import Horizons
+import numpy as np
 import pandas as pd
 
+# maximum number of discrete epochs sent to Horizons in one request
+HORIZONS_MAX_EPOCHS = 50
+# maximum number of concurrent Horizons requests; kept low as Horizons is a
+# shared public service and requests are already batched
+HORIZONS_MAX_WORKERS = 2
+
+# types of the FINK columns we use, so pandas does not have to infer them
+FINK_DTYPES = {'i:jd': 'float64', 'i:fid': 'int8', 'i:magpsf': 'float32', 'i:sigmapsf': 'float32'}
+
 def query_horizons(object_name, mjds, site_code="I41"):
     """
     Queries JPL Horizons for a solar system object at the specified MJDs and observatory site.
@@ -25,21 +37,26 @@ def query_horizons(object_name, mjds, site_code="I41"):
 
     TODO: choose nearest epoch JPL ID automatically instead of failing. 9/27/2024 COC
     """
-    results = []
+    # Convert MJD to JD.  Query each epoch once, in sorted order so each batch
+    # comes back in a known order; inverse maps the results back to mjds.
+    jds, inverse = np.unique(np.asarray(mjds, dtype=float) + 2400000.5, return_inverse=True)
+    jds = jds.tolist()
     
-    for mjd in mjds:
-        # Convert MJD to JD
-        jd = mjd + 2400000.5
-        
-        # Query Horizons
-        obj = Horizons(id=object_name, location=site_code, epochs=[jd])
-        eph = obj.ephemerides()
-        
-        # Convert the astropy table to a pandas DataFrame and append the result
-        results.append(eph.to_pandas())
+    def _query_one(epochs):
+        # Query Horizons for a batch of epochs in a single request
+        obj = Horizons(id=object_name, location=site_code, epochs=epochs)
+        return obj.ephemerides()
+    
+    # Overlap the network waits of the batches; map() keeps them in order
+    batches = [jds[i:i + HORIZONS_MAX_EPOCHS] for i in range(0, len(jds), HORIZONS_MAX_EPOCHS)]
+    with ThreadPoolExecutor(max_workers=HORIZONS_MAX_WORKERS) as ex:
+        tables = list(ex.map(_query_one, batches))
         
-    # Concatenate all results into a single DataFrame
-    df = pd.concat(results, ignore_index=True)
+    # Stack the astropy tables and convert to a pandas DataFrame once, in the order of mjds
+    df = vstack(tables).to_pandas()
+    if len(df) != len(jds):
+        raise ValueError(f'Horizons returned {len(df)} ephemerides for {len(jds)} requested epochs of {object_name}.')
+    df = df.iloc[inverse].reset_index(drop=True)
     
     return df
 
@@ -62,34 +79,39 @@ def get_fink_data(objname, verbose=True):
     )
     
     # Format output in a DataFrame
-    pdf = pd.read_json(io.BytesIO(r.content))
+    pdf = pd.read_json(io.BytesIO(r.content), dtype=FINK_DTYPES)
     if len(pdf) == 0:
         raise KeyError(f'No such object or no data found at broker.')
     
 #   print(pdf.columns)
     #
     # need MJD, so add a column via our function
-    pdf['mjd'] = pdf['i:jd'].apply(jd_to_mjd)
+    pdf['mjd'] = jd_to_mjd(pdf['i:jd'])
     #
     # aperture kludge 9/27/2024 COC
-    pdf['aper_arcsec'] = [0]*len(pdf) # 14 pixels, 1"/pixel; 14 is in the fink docs 9/27/2024 COC; 0 for now until these new fields make it into FINK-broker 9/27/2024 COC
+    pdf['aper_arcsec'] = 0 # 14 pixels, 1"/pixel; 14 is in the fink docs 9/27/2024 COC; 0 for now until these new fields make it into FINK-broker 9/27/2024 COC
     #
     # psf
     filter_dict = {1:'g', 2:'r'}
-    pdf['filter'] = [filter_dict[fid] for fid in pdf['i:fid']]
+    pdf['filter'] = pdf['i:fid'].map(filter_dict)
+    unknown = pdf['filter'].isna()
+    if unknown.any():
+        raise KeyError(f'Unknown FINK filter id(s): {sorted(set(pdf.loc[unknown, "i:fid"]))}')
     #
     jpl_df = query_horizons(object_name=objname, mjds=pdf['mjd'], site_code="I41")
 #   print(jpl_df.columns)
     #
     # make new dataframe
-    ndf = pd.DataFrame.from_dict({'mjd':pdf['mjd']})
-    ndf['rh'] = jpl_df['r']
-    ndf['delta'] = jpl_df['delta']
-    ndf['alpha'] = jpl_df['alpha']
-    ndf['aper_arcsec'] = pdf['aper_arcsec']
-    ndf['mag'] = pdf['i:magpsf']
-    ndf['mag_err'] = pdf['i:sigmapsf']
-    ndf['query_datetime'] = [now]*len(pdf)
+    ndf = pd.DataFrame({
+        'mjd': pdf['mjd'].values,
+        'rh': jpl_df['r'].values,
+        'delta': jpl_df['delta'].values,
+        'alpha': jpl_df['alpha'].values,
+        'aper_arcsec': pdf['aper_arcsec'].values,
+        'mag': pdf['i:magpsf'].values,
+        'mag_err': pdf['i:sigmapsf'].values,
+        'query_datetime': now,
+    })
     objname_clean = objname.replace('/','').replace(' ','')
     outfile = f'{objname_clean}_ZTF_FINK.csv'
     ndf.to_csv(outfile)